@@ -1,436 +1,514 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-
-from baseline_forecasting import run_baseline_forecasting
-
-# =====================================================
-# APPLICATION CONFIGURATION
-# =====================================================
-st.set_page_config(
-    page_title="Cashflow Forecasting Model",
-    layout="wide"
-)
-
-st.title("Cashflow Forecasting Model")
-
-# =====================================================
-# DATA INGESTION
-# =====================================================
-uploaded_file = st.file_uploader(
-    "Upload Cashflow Dataset",
-    type=["csv"]
-)
-
-if uploaded_file is None:
-    st.info("Please upload a cashflow CSV file to proceed.")
-    st.stop()
-
-# =====================================================
-# LOAD & VALIDATE DATA
-# =====================================================
-@st.cache_data
-def load_data(file):
-    df = pd.read_csv(file)
-    df["Date"] = pd.to_datetime(df["Date"])
-    return df
-
-df = load_data(uploaded_file)
-
-required_columns = {
-    "Date",
-    "Account_ID",
-    "Inflow_INR",
-    "Outflow_INR",
-    "Balance_INR"
-}
-
-if not required_columns.issubset(df.columns):
-    st.error(
-        "The uploaded dataset does not match the required schema.\n\n"
-        "Expected columns:\n"
-        "- Date\n- Account_ID\n- Inflow_INR\n- Outflow_INR\n- Balance_INR"
-    )
-    st.stop()
-
-# =====================================================
-# SIDEBAR — USER CONTROLS
-# =====================================================
-st.sidebar.header("Analysis Controls")
-
-view_mode = st.sidebar.radio(
-    "Analysis Level",
-    ["Bank Level", "Account Level"]
-)
-
-date_range = st.sidebar.date_input(
-    "Analysis Period",
-    [df["Date"].min().date(), df["Date"].max().date()]
-)
-
-stress_pct = st.sidebar.slider(
-    "Outflow Stress Scenario (%)",
-    min_value=0,
-    max_value=30,
-    value=10
-)
-
-unit_choice = st.sidebar.selectbox(
-    "Monetary Units",
-    ["INR", "Lakhs", "Millions"]
-)
-
-UNIT_CONFIG = {
-    "INR": (1, "₹"),
-    "Lakhs": (100_000, "₹ Lakhs"),
-    "Millions": (1_000_000, "₹ Millions")
-}
-
-unit_divisor, unit_label = UNIT_CONFIG[unit_choice]
-
-# =====================================================
-# DATE FILTERING
-# =====================================================
-start_date = pd.to_datetime(date_range[0])
-end_date = pd.to_datetime(date_range[1])
-
-df_filtered = df[
-    (df["Date"] >= start_date) &
-    (df["Date"] <= end_date)
-]
-
-if df_filtered.empty:
-    st.warning("No data available for the selected date range.")
-    st.stop()
-
-# =====================================================
-# FORECAST GENERATION (BASELINE MODEL)
-# =====================================================
-account_fc_all, bank_fc_all = run_baseline_forecasting(df, horizon=60)
-
-# Forecast should always be FUTURE relative to history
-last_hist_date = df["Date"].max()
-
-bank_fc = bank_fc_all[
-    bank_fc_all["Date"] > last_hist_date
-]
-
-account_fc = account_fc_all[
-    account_fc_all["Date"] > last_hist_date
-]
-
-# =====================================================
-# CONFIDENCE BAND CALCULATION
-# =====================================================
-def add_confidence_band(forecast_df, historical_df, z=1.65):
-    std_outflow = historical_df["Outflow_INR"].std()
-    forecast_df["Upper_Bound"] = forecast_df["Predicted_Outflow"] + z * std_outflow
-    forecast_df["Lower_Bound"] = forecast_df["Predicted_Outflow"] - z * std_outflow
-    return forecast_df
-
-# =====================================================
-# EXECUTIVE SUMMARY LOGIC
-# =====================================================
-def executive_summary(net_position, stress_level):
-    if net_position > 0 and stress_level < 10:
-        return (
-            "Liquidity conditions are healthy. Forecasted cashflows indicate surplus "
-            "availability, supporting investment or redeployment decisions."
-        )
-    elif stress_level >= 20:
-        return (
-            "Stress scenarios indicate elevated funding risk. Additional liquidity buffers "
-            "or proactive funding actions are recommended."
-        )
-    else:
-        return (
-            "Liquidity conditions are stable but warrant close monitoring, particularly "
-            "under adverse outflow scenarios."
-        )
-
-# =====================================================
-# BANK-LEVEL ANALYSIS
-# =====================================================
-if view_mode == "Bank Level":
-
-    st.subheader("Bank-Level Liquidity Overview (Selected Period)")
-
-    bank_hist = (
-        df_filtered
-        .groupby("Date")[["Inflow_INR", "Outflow_INR"]]
-        .sum()
-        .reset_index()
-    )
-
-    bank_hist["Net_Cash"] = bank_hist["Inflow_INR"] - bank_hist["Outflow_INR"]
-
-    for col in ["Inflow_INR", "Outflow_INR", "Net_Cash"]:
-        bank_hist[col] /= unit_divisor
-
-    total_inflow = bank_hist["Inflow_INR"].sum()
-    total_outflow = bank_hist["Outflow_INR"].sum()
-    net_position = total_inflow - total_outflow
-
-    c1, c2, c3 = st.columns(3)
-    c1.metric(f"Total Inflow ({unit_label})", f"{total_inflow:,.2f}")
-    c2.metric(f"Total Outflow ({unit_label})", f"{total_outflow:,.2f}")
-    c3.metric(f"Net Position ({unit_label})", f"{net_position:,.2f}")
-
-    st.markdown("#### Net Cash Position Over Time")
-
-    fig_net = px.line(
-        bank_hist,
-        x="Date",
-        y="Net_Cash",
-        markers=True
-    )
-
-    fig_net.add_hline(y=0, line_dash="dash")
-    fig_net.update_yaxes(
-        title=f"Net Cash ({unit_label})",
-        tickformat=",.2f",
-        separatethousands=True
-    )
-
-    fig_net.update_traces(
-        hovertemplate="Date=%{x}<br>Net Cash="
-        + unit_label + " %{y:,.2f}<extra></extra>"
-    )
-
-    st.plotly_chart(fig_net, use_container_width=True)
-
-    st.markdown("#### Inflow vs Outflow (Historical)")
-
-    fig_io = px.bar(
-        bank_hist,
-        x="Date",
-        y=["Inflow_INR", "Outflow_INR"],
-        barmode="group"
-    )
-
-    fig_io.update_yaxes(
-        title=f"Amount ({unit_label})",
-        tickformat=",.2f",
-        separatethousands=True
-    )
-
-    fig_io.update_traces(
-        hovertemplate="Date=%{x}<br>Amount="
-        + unit_label + " %{y:,.2f}<extra></extra>"
-    )
-
-    st.plotly_chart(fig_io, use_container_width=True)
-
-    if not bank_fc.empty:
-        bank_fc = add_confidence_band(bank_fc, df_filtered)
-
-        for col in ["Predicted_Outflow", "Upper_Bound", "Lower_Bound"]:
-            bank_fc[col] /= unit_divisor
-
-        bank_fc["Stress_Outflow"] = (
-            bank_fc["Predicted_Outflow"] * (1 + stress_pct / 100)
-        )
-
-        st.markdown("#### Forecasted Outflows with Stress Scenario")
-
-        fig_fc = px.line(
-            bank_fc,
-            x="Date",
-            y=["Predicted_Outflow", "Stress_Outflow"]
-        )
-
-        fig_fc.add_scatter(
-            x=bank_fc["Date"],
-            y=bank_fc["Upper_Bound"],
-            mode="lines",
-            name="Upper Confidence Bound",
-            line=dict(dash="dash")
-        )
-
-        fig_fc.add_scatter(
-            x=bank_fc["Date"],
-            y=bank_fc["Lower_Bound"],
-            mode="lines",
-            name="Lower Confidence Bound",
-            line=dict(dash="dash")
-        )
-
-        fig_fc.update_yaxes(
-            title=f"Outflow Amount ({unit_label})",
-            tickformat=",.2f",
-            separatethousands=True
-        )
-
-        fig_fc.update_traces(
-            hovertemplate="Date=%{x}<br>Amount="
-            + unit_label + " %{y:,.2f}<extra></extra>"
-        )
-
-        st.plotly_chart(fig_fc, use_container_width=True)
-
-        st.markdown("#### Forecasted Inflow vs Outflow")
-
-        fig_fc_io = px.line(
-            bank_fc,
-            x="Date",
-            y=["Predicted_Inflow", "Predicted_Outflow"],
-            markers=True
-        )
-
-        fig_fc_io.update_yaxes(
-            title=f"Amount ({unit_label})",
-            tickformat=",.2f",
-            separatethousands=True
-        )
-
-        fig_fc_io.update_traces(
-            hovertemplate="Date=%{x}<br>Amount="
-            + unit_label + " %{y:,.2f}<extra></extra>"
-        )
-
-        st.plotly_chart(fig_fc_io, use_container_width=True)
-
-    st.markdown("#### Executive Summary")
-    st.info(executive_summary(net_position, stress_pct))
-
-# =====================================================
-# ACCOUNT-LEVEL ANALYSIS
-# =====================================================
-else:
-
-    st.subheader("Account-Level Liquidity Overview")
-
-    account_id = st.sidebar.selectbox(
-        "Select Account",
-        sorted(df_filtered["Account_ID"].unique())
-    )
-
-    acc = df_filtered[df_filtered["Account_ID"] == account_id].copy()
-    acc["Net_Cash"] = acc["Inflow_INR"] - acc["Outflow_INR"]
-
-    for col in ["Inflow_INR", "Outflow_INR", "Balance_INR", "Net_Cash"]:
-        acc[col] /= unit_divisor
-
-    avg_inflow = acc["Inflow_INR"].mean()
-    avg_outflow = acc["Outflow_INR"].mean()
-    current_balance = acc["Balance_INR"].iloc[-1]
-
-    risk_level = "Low"
-    if current_balance < 0:
-        risk_level = "High"
-    elif current_balance < avg_outflow * 3:
-        risk_level = "Medium"
-
-    c1, c2, c3 = st.columns(3)
-    c1.metric(f"Average Inflow ({unit_label})", f"{avg_inflow:,.2f}")
-    c2.metric(f"Average Outflow ({unit_label})", f"{avg_outflow:,.2f}")
-    c3.metric(f"Opening Balance for Forecast ({unit_label})", f"{current_balance:,.2f}")
-
-    st.caption(
-        f"Balance as of {acc['Date'].max().date()} — used as forecast starting point"
-    )
-
-    if not account_fc.empty:
-        forecast_start = acc["Date"].max()
-        tomorrow = forecast_start + pd.Timedelta(days=1)
-
-        tomorrow_fc = account_fc[
-            (account_fc["Account_ID"] == account_id) &
-            (account_fc["Date"] == tomorrow)
-        ]
-
-        if not tomorrow_fc.empty:
-            
-            base_inflow = tomorrow_fc["Predicted_Inflow"].iloc[0]
-            base_outflow = tomorrow_fc["Predicted_Outflow"].iloc[0]
-
-            stressed_outflow = base_outflow * (1 + stress_pct / 100)
-
-            # Unstressed projection
-            projected_balance_base = (
-                current_balance
-                + (base_inflow - base_outflow) / unit_divisor
-            )
-        
-            # Stressed projection
-            projected_balance_stress = (
-                current_balance
-                + (base_inflow - stressed_outflow) / unit_divisor
-            )
-        
-            stress_impact = projected_balance_stress - projected_balance_base
-        
-            c_base, c_stress = st.columns(2)
-        
-            c_base.metric(
-                f"Projected Balance (Tomorrow) ({unit_label})",
-                f"{projected_balance_base:,.2f}"
-            )
-        
-            c_stress.metric(
-                f"Projected Balance Under Stress ({unit_label})",
-                f"{projected_balance_stress:,.2f}",
-                delta=f"{stress_impact:,.2f}"
-            )
-        
-            st.caption(
-                f"Stress scenario assumes {stress_pct}% higher outflows tomorrow"
-            )
-
-
-    st.markdown(f"**Funding Risk Classification:** {risk_level}")
-
-    fig_acc = px.line(
-        acc,
-        x="Date",
-        y="Net_Cash",
-        markers=True
-    )
-
-    fig_acc.add_hline(y=0, line_dash="dash")
-    fig_acc.update_yaxes(
-        title=f"Net Cash ({unit_label})",
-        tickformat=",.2f",
-        separatethousands=True
-    )
-
-    fig_acc.update_traces(
-        hovertemplate="Date=%{x}<br>Net Cash="
-        + unit_label + " %{y:,.2f}<extra></extra>"
-    )
-
-    st.plotly_chart(fig_acc, use_container_width=True)
-
-    st.markdown("#### Inflow vs Outflow (Historical)")
-
-    fig_acc_io = px.bar(
-        acc,
-        x="Date",
-        y=["Inflow_INR", "Outflow_INR"],
-        barmode="group"
-    )
-
-    fig_acc_io.update_yaxes(
-        title=f"Amount ({unit_label})",
-        tickformat=",.2f",
-        separatethousands=True
-    )
-
-    fig_acc_io.update_traces(
-        hovertemplate="Date=%{x}<br>Amount="
-        + unit_label + " %{y:,.2f}<extra></extra>"
-    )
-
-    st.plotly_chart(fig_acc_io, use_container_width=True)
-
-# =====================================================
-# APPLICATION FOOTER
-# =====================================================
-st.markdown("---")
-st.success(
-    "System status: Operational. Forecasts, stress scenarios, and liquidity insights "
-    "are based on historical behavior and baseline statistical modeling."
-)
-
-
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from baseline_forecasting import run_baseline_forecasting
+
+# Cap on points sent to the browser per line chart
+MAX_CHART_POINTS = 2000
+
+
+def downsample_for_chart(frame, y_cols, n_out=MAX_CHART_POINTS):
+    """
+    LTTB-style downsampling: keep the min and max of every bucket so the
+    rendered line preserves peaks and troughs while the browser receives
+    a bounded number of points regardless of history length.
+    """
+    if len(frame) <= n_out:
+        return frame
+
+    frame = frame.reset_index(drop=True)
+    buckets = frame.index * (n_out // 2) // len(frame)
+    grouped = frame.groupby(buckets, sort=False)
+
+    keep = [frame.index[0], frame.index[-1]]
+    for col in y_cols:
+        keep.extend(grouped[col].idxmin())
+        keep.extend(grouped[col].idxmax())
+
+    return frame.loc[np.unique(keep)]
+
+
+@st.cache_data(show_spinner=False)
+def line_figure(frame, x, y_cols, markers=False):
+    """
+    WebGL line chart over downsampled data (fast past ~20k points).
+
+    Cached on the input data, so reruns that don't change the underlying
+    frame reuse the already-built traces instead of reconstructing them;
+    callers get a fresh copy and may mutate layout freely.
+    """
+    frame = downsample_for_chart(frame, y_cols)
+    mode = "lines+markers" if markers else "lines"
+
+    fig = go.Figure()
+    for col in y_cols:
+        fig.add_trace(go.Scattergl(
+            x=frame[x],
+            y=frame[col],
+            mode=mode,
+            name=col
+        ))
+    return fig
+
+# =====================================================
+# APPLICATION CONFIGURATION
+# =====================================================
+st.set_page_config(
+    page_title="Cashflow Forecasting Model",
+    layout="wide"
+)
+
+st.title("Cashflow Forecasting Model")
+
+# =====================================================
+# DATA INGESTION
+# =====================================================
+uploaded_file = st.file_uploader(
+    "Upload Cashflow Dataset",
+    type=["csv"]
+)
+
+if uploaded_file is None:
+    st.info("Please upload a cashflow CSV file to proceed.")
+    st.stop()
+
+# =====================================================
+# LOAD & VALIDATE DATA
+# =====================================================
+@st.cache_data
+def load_data(file):
+    # Multithreaded C++ CSV parser instead of the default engine
+    df = pd.read_csv(file, engine="pyarrow")
+    df["Date"] = pd.to_datetime(df["Date"])
+    # Category dtype: one code per account instead of repeated strings
+    df["Account_ID"] = df["Account_ID"].astype("category")
+    # Monetary columns don't need float64 precision; halve their footprint
+    for col in ["Inflow_INR", "Outflow_INR", "Balance_INR"]:
+        if col in df.columns:
+            df[col] = df[col].astype("float32")
+    # Keep rows sorted by Date so period filtering can binary-search
+    return df.sort_values("Date", ignore_index=True)
+
+df = load_data(uploaded_file)
+
+required_columns = {
+    "Date",
+    "Account_ID",
+    "Inflow_INR",
+    "Outflow_INR",
+    "Balance_INR"
+}
+
+if not required_columns.issubset(df.columns):
+    st.error(
+        "The uploaded dataset does not match the required schema.\n\n"
+        "Expected columns:\n"
+        "- Date\n- Account_ID\n- Inflow_INR\n- Outflow_INR\n- Balance_INR"
+    )
+    st.stop()
+
+# =====================================================
+# SIDEBAR — USER CONTROLS
+# =====================================================
+st.sidebar.header("Analysis Controls")
+
+view_mode = st.sidebar.radio(
+    "Analysis Level",
+    ["Bank Level", "Account Level"]
+)
+
+date_range = st.sidebar.date_input(
+    "Analysis Period",
+    [df["Date"].min().date(), df["Date"].max().date()]
+)
+
+stress_pct = st.sidebar.slider(
+    "Outflow Stress Scenario (%)",
+    min_value=0,
+    max_value=30,
+    value=10
+)
+
+unit_choice = st.sidebar.selectbox(
+    "Monetary Units",
+    ["INR", "Lakhs", "Millions"]
+)
+
+UNIT_CONFIG = {
+    "INR": (1, "₹"),
+    "Lakhs": (100_000, "₹ Lakhs"),
+    "Millions": (1_000_000, "₹ Millions")
+}
+
+unit_divisor, unit_label = UNIT_CONFIG[unit_choice]
+
+# =====================================================
+# DATE FILTERING
+# =====================================================
+start_date = pd.to_datetime(date_range[0])
+end_date = pd.to_datetime(date_range[1])
+
+# Date-sorted frame: binary-search the period bounds and take a
+# positional slice instead of materializing a full boolean mask
+lo = df["Date"].searchsorted(start_date, side="left")
+hi = df["Date"].searchsorted(end_date + pd.Timedelta(days=1), side="left")
+df_filtered = df.iloc[lo:hi]
+
+if df_filtered.empty:
+    st.warning("No data available for the selected date range.")
+    st.stop()
+
+# =====================================================
+# FORECAST GENERATION (BASELINE MODEL)
+# =====================================================
+# Cached on the dataframe contents, so widget interactions
+# (sliders, radios, selectboxes) never re-run the forecast.
+@st.cache_data(show_spinner=False)
+def cached_forecast(df, horizon):
+    return run_baseline_forecasting(df, horizon=horizon)
+
+account_fc_all, bank_fc_all = cached_forecast(df, horizon=60)
+
+# Forecast should always be FUTURE relative to history
+last_hist_date = df["Date"].max()
+
+bank_fc = bank_fc_all[
+    bank_fc_all["Date"] > last_hist_date
+]
+
+account_fc = account_fc_all[
+    account_fc_all["Date"] > last_hist_date
+]
+
+# =====================================================
+# CONFIDENCE BAND CALCULATION
+# =====================================================
+# The band width is a single scalar per selected period; cache it so
+# reruns neither rescan the history nor hash the forecast frame
+@st.cache_data(show_spinner=False)
+def outflow_std(historical_df):
+    return float(historical_df["Outflow_INR"].std())
+
+
+def add_confidence_band(forecast_df, std_outflow, z=1.65):
+    band = z * std_outflow
+    forecast_df["Upper_Bound"] = forecast_df["Predicted_Outflow"] + band
+    forecast_df["Lower_Bound"] = forecast_df["Predicted_Outflow"] - band
+    return forecast_df
+
+# =====================================================
+# EXECUTIVE SUMMARY LOGIC
+# =====================================================
+def executive_summary(net_position, stress_level):
+    if net_position > 0 and stress_level < 10:
+        return (
+            "Liquidity conditions are healthy. Forecasted cashflows indicate surplus "
+            "availability, supporting investment or redeployment decisions."
+        )
+    elif stress_level >= 20:
+        return (
+            "Stress scenarios indicate elevated funding risk. Additional liquidity buffers "
+            "or proactive funding actions are recommended."
+        )
+    else:
+        return (
+            "Liquidity conditions are stable but warrant close monitoring, particularly "
+            "under adverse outflow scenarios."
+        )
+
+# =====================================================
+# BANK-LEVEL ANALYSIS
+# =====================================================
+if view_mode == "Bank Level":
+
+    st.subheader("Bank-Level Liquidity Overview (Selected Period)")
+
+    @st.cache_data(show_spinner=False)
+    def bank_history(df_filtered):
+        hist = (
+            df_filtered
+            .groupby("Date", sort=False, observed=True)[["Inflow_INR", "Outflow_INR"]]
+            .sum()
+            .reset_index()
+        )
+        hist["Net_Cash"] = hist["Inflow_INR"] - hist["Outflow_INR"]
+        return hist
+
+    bank_hist = bank_history(df_filtered)
+
+    # One in-place vectorized division across all three columns
+    bank_hist[["Inflow_INR", "Outflow_INR", "Net_Cash"]] /= unit_divisor
+
+    total_inflow = bank_hist["Inflow_INR"].sum()
+    total_outflow = bank_hist["Outflow_INR"].sum()
+    net_position = total_inflow - total_outflow
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric(f"Total Inflow ({unit_label})", f"{total_inflow:,.2f}")
+    c2.metric(f"Total Outflow ({unit_label})", f"{total_outflow:,.2f}")
+    c3.metric(f"Net Position ({unit_label})", f"{net_position:,.2f}")
+
+    st.markdown("#### Net Cash Position Over Time")
+
+    fig_net = line_figure(
+        bank_hist,
+        x="Date",
+        y_cols=["Net_Cash"],
+        markers=True
+    )
+
+    fig_net.add_hline(y=0, line_dash="dash")
+    fig_net.update_yaxes(
+        title=f"Net Cash ({unit_label})",
+        tickformat=",.2f",
+        separatethousands=True
+    )
+
+    fig_net.update_traces(
+        hovertemplate="Date=%{x}<br>Net Cash="
+        + unit_label + " %{y:,.2f}<extra></extra>"
+    )
+
+    st.plotly_chart(fig_net, use_container_width=True)
+
+    st.markdown("#### Inflow vs Outflow (Historical)")
+
+    fig_io = px.bar(
+        bank_hist,
+        x="Date",
+        y=["Inflow_INR", "Outflow_INR"],
+        barmode="group"
+    )
+
+    fig_io.update_yaxes(
+        title=f"Amount ({unit_label})",
+        tickformat=",.2f",
+        separatethousands=True
+    )
+
+    fig_io.update_traces(
+        hovertemplate="Date=%{x}<br>Amount="
+        + unit_label + " %{y:,.2f}<extra></extra>"
+    )
+
+    st.plotly_chart(fig_io, use_container_width=True)
+
+    if not bank_fc.empty:
+        # Work on a copy: bank_fc slices the cached forecast and the
+        # unit scaling below mutates in place
+        bank_fc = add_confidence_band(bank_fc.copy(), outflow_std(df_filtered))
+
+        bank_fc[["Predicted_Outflow", "Upper_Bound", "Lower_Bound"]] /= unit_divisor
+
+        bank_fc["Stress_Outflow"] = (
+            bank_fc["Predicted_Outflow"] * (1 + stress_pct / 100)
+        )
+
+        st.markdown("#### Forecasted Outflows with Stress Scenario")
+
+        fig_fc = line_figure(
+            bank_fc,
+            x="Date",
+            y_cols=["Predicted_Outflow", "Stress_Outflow"]
+        )
+
+        bank_fc_ds = downsample_for_chart(
+            bank_fc, ["Upper_Bound", "Lower_Bound"]
+        )
+
+        fig_fc.add_trace(go.Scattergl(
+            x=bank_fc_ds["Date"],
+            y=bank_fc_ds["Upper_Bound"],
+            mode="lines",
+            name="Upper Confidence Bound",
+            line=dict(dash="dash")
+        ))
+
+        fig_fc.add_trace(go.Scattergl(
+            x=bank_fc_ds["Date"],
+            y=bank_fc_ds["Lower_Bound"],
+            mode="lines",
+            name="Lower Confidence Bound",
+            line=dict(dash="dash")
+        ))
+
+        fig_fc.update_yaxes(
+            title=f"Outflow Amount ({unit_label})",
+            tickformat=",.2f",
+            separatethousands=True
+        )
+
+        fig_fc.update_traces(
+            hovertemplate="Date=%{x}<br>Amount="
+            + unit_label + " %{y:,.2f}<extra></extra>"
+        )
+
+        st.plotly_chart(fig_fc, use_container_width=True)
+
+        st.markdown("#### Forecasted Inflow vs Outflow")
+
+        fig_fc_io = line_figure(
+            bank_fc,
+            x="Date",
+            y_cols=["Predicted_Inflow", "Predicted_Outflow"],
+            markers=True
+        )
+
+        fig_fc_io.update_yaxes(
+            title=f"Amount ({unit_label})",
+            tickformat=",.2f",
+            separatethousands=True
+        )
+
+        fig_fc_io.update_traces(
+            hovertemplate="Date=%{x}<br>Amount="
+            + unit_label + " %{y:,.2f}<extra></extra>"
+        )
+
+        st.plotly_chart(fig_fc_io, use_container_width=True)
+
+    st.markdown("#### Executive Summary")
+    st.info(executive_summary(net_position, stress_pct))
+
+# =====================================================
+# ACCOUNT-LEVEL ANALYSIS
+# =====================================================
+else:
+
+    st.subheader("Account-Level Liquidity Overview")
+
+    account_id = st.sidebar.selectbox(
+        "Select Account",
+        sorted(df_filtered["Account_ID"].unique())
+    )
+
+    acc = df_filtered[df_filtered["Account_ID"] == account_id].copy()
+    acc["Net_Cash"] = acc["Inflow_INR"] - acc["Outflow_INR"]
+
+    acc[["Inflow_INR", "Outflow_INR", "Balance_INR", "Net_Cash"]] /= unit_divisor
+
+    avg_inflow = acc["Inflow_INR"].mean()
+    avg_outflow = acc["Outflow_INR"].mean()
+    current_balance = acc["Balance_INR"].iloc[-1]
+
+    risk_level = "Low"
+    if current_balance < 0:
+        risk_level = "High"
+    elif current_balance < avg_outflow * 3:
+        risk_level = "Medium"
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric(f"Average Inflow ({unit_label})", f"{avg_inflow:,.2f}")
+    c2.metric(f"Average Outflow ({unit_label})", f"{avg_outflow:,.2f}")
+    c3.metric(f"Opening Balance for Forecast ({unit_label})", f"{current_balance:,.2f}")
+
+    st.caption(
+        f"Balance as of {acc['Date'].max().date()} — used as forecast starting point"
+    )
+
+    if not account_fc.empty:
+        forecast_start = acc["Date"].max()
+        tomorrow = forecast_start + pd.Timedelta(days=1)
+
+        tomorrow_fc = account_fc[
+            (account_fc["Account_ID"] == account_id) &
+            (account_fc["Date"] == tomorrow)
+        ]
+
+        if not tomorrow_fc.empty:
+            
+            base_inflow = tomorrow_fc["Predicted_Inflow"].iloc[0]
+            base_outflow = tomorrow_fc["Predicted_Outflow"].iloc[0]
+
+            stressed_outflow = base_outflow * (1 + stress_pct / 100)
+
+            # Unstressed projection
+            projected_balance_base = (
+                current_balance
+                + (base_inflow - base_outflow) / unit_divisor
+            )
+        
+            # Stressed projection
+            projected_balance_stress = (
+                current_balance
+                + (base_inflow - stressed_outflow) / unit_divisor
+            )
+        
+            stress_impact = projected_balance_stress - projected_balance_base
+        
+            c_base, c_stress = st.columns(2)
+        
+            c_base.metric(
+                f"Projected Balance (Tomorrow) ({unit_label})",
+                f"{projected_balance_base:,.2f}"
+            )
+        
+            c_stress.metric(
+                f"Projected Balance Under Stress ({unit_label})",
+                f"{projected_balance_stress:,.2f}",
+                delta=f"{stress_impact:,.2f}"
+            )
+        
+            st.caption(
+                f"Stress scenario assumes {stress_pct}% higher outflows tomorrow"
+            )
+
+
+    st.markdown(f"**Funding Risk Classification:** {risk_level}")
+
+    fig_acc = line_figure(
+        acc,
+        x="Date",
+        y_cols=["Net_Cash"],
+        markers=True
+    )
+
+    fig_acc.add_hline(y=0, line_dash="dash")
+    fig_acc.update_yaxes(
+        title=f"Net Cash ({unit_label})",
+        tickformat=",.2f",
+        separatethousands=True
+    )
+
+    fig_acc.update_traces(
+        hovertemplate="Date=%{x}<br>Net Cash="
+        + unit_label + " %{y:,.2f}<extra></extra>"
+    )
+
+    st.plotly_chart(fig_acc, use_container_width=True)
+
+    st.markdown("#### Inflow vs Outflow (Historical)")
+
+    fig_acc_io = px.bar(
+        acc,
+        x="Date",
+        y=["Inflow_INR", "Outflow_INR"],
+        barmode="group"
+    )
+
+    fig_acc_io.update_yaxes(
+        title=f"Amount ({unit_label})",
+        tickformat=",.2f",
+        separatethousands=True
+    )
+
+    fig_acc_io.update_traces(
+        hovertemplate="Date=%{x}<br>Amount="
+        + unit_label + " %{y:,.2f}<extra></extra>"
+    )
+
+    st.plotly_chart(fig_acc_io, use_container_width=True)
+
+# =====================================================
+# APPLICATION FOOTER
+# =====================================================
+st.markdown("---")
+st.success(
+    "System status: Operational. Forecasts, stress scenarios, and liquidity insights "
+    "are based on historical behavior and baseline statistical modeling."
+)
+
+
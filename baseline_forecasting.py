@@ -1,98 +1,173 @@
-import pandas as pd
-import numpy as np
-
-# =====================================================
-# BASELINE INFLOW / OUTFLOW FORECASTING
-# =====================================================
-
-def run_baseline_forecasting(df, horizon=14, rolling_window=14, alpha=0.7):
-    """
-    Baseline forecast using:
-    - Rolling mean
-    - Day-of-week seasonality
-
-    Returns:
-    - account_level_forecast
-    - bank_level_forecast
-    """
-
-    df = df.copy()
-    df["Date"] = pd.to_datetime(df["Date"])
-    df = df.sort_values(["Account_ID", "Date"])
-    df["DayOfWeek"] = df["Date"].dt.dayofweek
-
-    forecasts = []
-
-    # -------------------------------------------------
-    # ACCOUNT LEVEL BASELINE
-    # -------------------------------------------------
-    for acc, g in df.groupby("Account_ID"):
-        g = g.sort_values("Date")
-
-        last_date = g["Date"].max()
-
-        # Rolling means
-        roll_in = g["Inflow_INR"].tail(rolling_window).mean()
-        roll_out = g["Outflow_INR"].tail(rolling_window).mean()
-
-        # Day-of-week averages
-        dow_profile = (
-            g.groupby("DayOfWeek")[["Inflow_INR", "Outflow_INR"]]
-            .mean()
-            .to_dict()
-        )
-
-        future_dates = pd.date_range(
-            start=last_date + pd.Timedelta(days=1),
-            periods=horizon,
-            freq="D"
-        )
-
-        for d in future_dates:
-            dow = d.dayofweek
-
-            dow_in = dow_profile["Inflow_INR"].get(dow, roll_in)
-            dow_out = dow_profile["Outflow_INR"].get(dow, roll_out)
-
-            pred_in = alpha * roll_in + (1 - alpha) * dow_in
-            pred_out = alpha * roll_out + (1 - alpha) * dow_out
-
-            forecasts.append({
-                "Date": d,
-                "Account_ID": acc,
-                "Predicted_Inflow": max(pred_in, 0),
-                "Predicted_Outflow": max(pred_out, 0),
-                "Model": "BASELINE"
-            })
-
-    account_forecast = pd.DataFrame(forecasts)
-
-    # -------------------------------------------------
-    # BANK LEVEL BASELINE (AGGREGATED)
-    # -------------------------------------------------
-    bank_forecast = (
-        account_forecast
-        .groupby("Date")[["Predicted_Inflow", "Predicted_Outflow"]]
-        .sum()
-        .reset_index()
-    )
-
-    bank_forecast["Model"] = "BASELINE_BANK"
-
-    return account_forecast, bank_forecast
-
-
-# =====================================================
-# TEST RUN
-# =====================================================
-if __name__ == "__main__":
-    df = pd.read_csv("sample_cashflow.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
-
-    acc_fc, bank_fc = run_baseline_forecasting(df)
-
-    print("ACCOUNT LEVEL BASELINE:")
-    print(acc_fc.head())
-
-    print("\nBANK LEVEL BASELINE:")
-    print(bank_fc.head())
+import pandas as pd
+import polars as pl
+import numpy as np
+from numba import njit, prange
+
+# =====================================================
+# BASELINE INFLOW / OUTFLOW FORECASTING
+# =====================================================
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _baseline_kernel(roll_in, roll_out, dow_in, dow_out, last_dow, horizon, alpha):
+    """
+    Compiled forecast kernel.
+
+    For each account and horizon day, blends the rolling mean with the
+    day-of-week average and clamps at zero. Parallel across accounts.
+    Inputs must be NaN-free: fastmath assumes no NaNs, so the caller
+    fills missing day-of-week cells with the rolling mean beforehand.
+    """
+    n_acc = roll_in.shape[0]
+    out = np.empty((n_acc, horizon, 2), dtype=np.float32)
+
+    for a in prange(n_acc):
+        for h in range(horizon):
+            d = (last_dow[a] + 1 + h) % 7
+
+            out[a, h, 0] = max(
+                alpha * roll_in[a] + (1 - alpha) * dow_in[a, d], 0.0
+            )
+            out[a, h, 1] = max(
+                alpha * roll_out[a] + (1 - alpha) * dow_out[a, d], 0.0
+            )
+
+    return out
+
+
+def run_baseline_forecasting(df, horizon=14, rolling_window=14, alpha=0.7):
+    """
+    Baseline forecast using:
+    - Rolling mean
+    - Day-of-week seasonality
+
+    Returns:
+    - account_level_forecast
+    - bank_level_forecast
+    """
+
+    # Read-only access to the caller's frame; no defensive deep copy
+    dates = pd.to_datetime(df["Date"])
+
+    # -------------------------------------------------
+    # ACCOUNT LEVEL BASELINE (POLARS LAZY + COMPILED KERNEL)
+    # -------------------------------------------------
+    codes, accounts = pd.factorize(df["Account_ID"])
+    n_acc = len(accounts)
+
+    # All pre-aggregation runs as lazy polars queries, collected in one
+    # optimized pass over the data
+    lf = pl.LazyFrame({
+        "Acc_Code": codes,
+        "Date": dates.to_numpy(dtype="datetime64[ns]"),
+        "Inflow_INR": df["Inflow_INR"].to_numpy(),
+        "Outflow_INR": df["Outflow_INR"].to_numpy()
+    }).sort("Date")
+
+    q_last = lf.group_by("Acc_Code").agg(
+        pl.col("Date").max().alias("Last_Date")
+    )
+
+    q_roll = lf.group_by("Acc_Code").agg(
+        pl.col("Inflow_INR").tail(rolling_window).mean().alias("Roll_Inflow"),
+        pl.col("Outflow_INR").tail(rolling_window).mean().alias("Roll_Outflow")
+    )
+
+    q_dow = lf.group_by(
+        "Acc_Code", pl.col("Date").dt.weekday().alias("DayOfWeek") - 1
+    ).agg(
+        pl.col("Inflow_INR").mean().alias("DoW_Inflow"),
+        pl.col("Outflow_INR").mean().alias("DoW_Outflow")
+    )
+
+    last, roll, dow = pl.collect_all([q_last, q_roll, q_dow])
+
+    # Dense per-account arrays for the kernel, indexed by account code
+    last_date = np.empty(n_acc, dtype="datetime64[ns]")
+    last_date[last["Acc_Code"].to_numpy()] = last["Last_Date"].to_numpy()
+    last_dow = pd.DatetimeIndex(last_date).dayofweek.to_numpy()
+
+    roll_in = np.empty(n_acc, dtype=np.float32)
+    roll_out = np.empty(n_acc, dtype=np.float32)
+    roll_in[roll["Acc_Code"].to_numpy()] = roll["Roll_Inflow"].to_numpy()
+    roll_out[roll["Acc_Code"].to_numpy()] = roll["Roll_Outflow"].to_numpy()
+
+    # (n_acc, 7) day-of-week matrices, NaN where an account has no
+    # history for that weekday
+    dow_in = np.full((n_acc, 7), np.nan, dtype=np.float32)
+    dow_out = np.full((n_acc, 7), np.nan, dtype=np.float32)
+    dow_idx = (dow["Acc_Code"].to_numpy(), dow["DayOfWeek"].to_numpy())
+    dow_in[dow_idx] = dow["DoW_Inflow"].to_numpy()
+    dow_out[dow_idx] = dow["DoW_Outflow"].to_numpy()
+
+    # Weekdays with no history fall back to the rolling mean; resolved
+    # here because the fastmath kernel cannot branch on NaN
+    dow_in = np.where(np.isnan(dow_in), roll_in[:, None], dow_in)
+    dow_out = np.where(np.isnan(dow_out), roll_out[:, None], dow_out)
+
+    preds = _baseline_kernel(
+        roll_in, roll_out, dow_in, dow_out, last_dow, horizon, alpha
+    )
+
+    # Reshape the (n_acc, horizon, 2) block into a long DataFrame once;
+    # the date grid broadcasts straight into its final array
+    offsets = np.arange(1, horizon + 1).astype("timedelta64[D]")
+    future_dates = (last_date[:, None] + offsets).ravel()
+
+    account_forecast = pd.DataFrame({
+        "Date": future_dates,
+        # np.asarray keeps the factorize codes aligned positionally:
+        # from_codes on a CategoricalIndex would resolve them against its
+        # sorted dtype categories instead of appearance order
+        "Account_ID": pd.Categorical.from_codes(
+            np.repeat(np.arange(n_acc), horizon),
+            categories=np.asarray(accounts)
+        ),
+        "Predicted_Inflow": preds[:, :, 0].ravel(),
+        "Predicted_Outflow": preds[:, :, 1].ravel(),
+        "Model": "BASELINE"
+    })
+
+    # -------------------------------------------------
+    # BANK LEVEL BASELINE (AGGREGATED)
+    # -------------------------------------------------
+    # Dates form a small contiguous range, so the rollup is two weighted
+    # bincounts over day codes instead of a hash-based groupby
+    first_day = future_dates.min()
+    day_codes = (future_dates - first_day) // np.timedelta64(1, "D")
+    n_days = int(day_codes.max()) + 1
+
+    day_counts = np.bincount(day_codes, minlength=n_days)
+    in_sums = np.bincount(
+        day_codes, weights=preds[:, :, 0].ravel(), minlength=n_days
+    )
+    out_sums = np.bincount(
+        day_codes, weights=preds[:, :, 1].ravel(), minlength=n_days
+    )
+
+    # Keep only days that actually carry forecast rows
+    observed_days = day_counts > 0
+
+    bank_forecast = pd.DataFrame({
+        "Date": first_day + np.arange(n_days)[observed_days].astype("timedelta64[D]"),
+        "Predicted_Inflow": in_sums[observed_days].astype(np.float32),
+        "Predicted_Outflow": out_sums[observed_days].astype(np.float32),
+        "Model": "BASELINE_BANK"
+    })
+
+    return account_forecast, bank_forecast
+
+
+# =====================================================
+# TEST RUN
+# =====================================================
+if __name__ == "__main__":
+    df = pd.read_csv("sample_cashflow.csv")
+    df["Date"] = pd.to_datetime(df["Date"])
+
+    acc_fc, bank_fc = run_baseline_forecasting(df)
+
+    print("ACCOUNT LEVEL BASELINE:")
+    print(acc_fc.head())
+
+    print("\nBANK LEVEL BASELINE:")
+    print(bank_fc.head())
@@ -1,152 +1,160 @@
-import pandas as pd
-import numpy as np
-
-# =====================================================
-# 1. PREPROCESS
-# =====================================================
-def preprocess(df):
-    df = df.copy()
-    df["Date"] = pd.to_datetime(df["Date"])
-    df = df.sort_values(["Account_ID", "Date"])
-
-    # Net cash movement
-    df["Net_Cash"] = df["Inflow_INR"] - df["Outflow_INR"]
-
-    # Calendar features
-    df["DayOfWeek"] = df["Date"].dt.dayofweek
-    df["DayOfMonth"] = df["Date"].dt.day
-    df["Is_Month_End"] = (df["DayOfMonth"] >= 25).astype(int)
-
-    return df
-
-
-# =====================================================
-# 2. ACCOUNT-LEVEL BEHAVIOR METRICS
-# =====================================================
-def account_behavior_metrics(df):
-    records = []
-
-    for acc, g in df.groupby("Account_ID"):
-        avg_in = g["Inflow_INR"].mean()
-        avg_out = g["Outflow_INR"].mean()
-
-        std_in = g["Inflow_INR"].std()
-        std_out = g["Outflow_INR"].std()
-
-        cv_in = std_in / avg_in if avg_in > 0 else np.nan
-        cv_out = std_out / avg_out if avg_out > 0 else np.nan
-
-        stability_score = 1 / (1 + cv_out) if not np.isnan(cv_out) else 0
-
-        records.append({
-            "Account_ID": acc,
-            "Avg_Inflow": avg_in,
-            "Avg_Outflow": avg_out,
-            "Net_Flow": avg_in - avg_out,
-            "Outflow_Volatility": std_out,
-            "Outflow_CV": cv_out,
-            "Stability_Score": stability_score
-        })
-
-    return pd.DataFrame(records)
-
-
-# =====================================================
-# 3. STRUCTURAL vs VOLATILE CASH
-# =====================================================
-def structural_cash_estimation(df, quantile=0.25):
-    rows = []
-
-    for acc, g in df.groupby("Account_ID"):
-        structural_inflow = g["Inflow_INR"].quantile(quantile)
-        mean_inflow = g["Inflow_INR"].mean()
-
-        volatile_part = max(mean_inflow - structural_inflow, 0)
-
-        rows.append({
-            "Account_ID": acc,
-            "Structural_Inflow": structural_inflow,
-            "Volatile_Inflow": volatile_part,
-            "Structural_Ratio": structural_inflow / mean_inflow if mean_inflow > 0 else 0
-        })
-
-    return pd.DataFrame(rows)
-
-
-# =====================================================
-# 4. SEASONALITY & DATE EFFECTS
-# =====================================================
-def seasonality_analysis(df):
-    # Day-of-week pattern
-    dow = (
-        df.groupby("DayOfWeek")[["Inflow_INR", "Outflow_INR"]]
-        .mean()
-        .reset_index()
-    )
-
-    # Month-end behavior
-    month_end = (
-        df.groupby("Is_Month_End")[["Inflow_INR", "Outflow_INR"]]
-        .mean()
-        .reset_index()
-    )
-
-    return dow, month_end
-
-
-# =====================================================
-# 5. BANK-LEVEL ROLLUP
-# =====================================================
-def bank_level_summary(df):
-    bank_daily = (
-        df.groupby("Date")[["Inflow_INR", "Outflow_INR", "Net_Cash"]]
-        .sum()
-        .reset_index()
-    )
-
-    summary = {
-        "Avg_Daily_Inflow": bank_daily["Inflow_INR"].mean(),
-        "Avg_Daily_Outflow": bank_daily["Outflow_INR"].mean(),
-        "Net_Position": bank_daily["Net_Cash"].mean(),
-        "Outflow_Volatility": bank_daily["Outflow_INR"].std()
-    }
-
-    return bank_daily, summary
-
-
-# =====================================================
-# 6. MASTER PIPELINE
-# =====================================================
-def run_behavior_intelligence(df):
-    df = preprocess(df)
-
-    account_metrics = account_behavior_metrics(df)
-    structural_cash = structural_cash_estimation(df)
-    dow_pattern, month_end_pattern = seasonality_analysis(df)
-    bank_daily, bank_summary = bank_level_summary(df)
-
-    return {
-        "account_metrics": account_metrics,
-        "structural_cash": structural_cash,
-        "day_of_week_pattern": dow_pattern,
-        "month_end_pattern": month_end_pattern,
-        "bank_daily": bank_daily,
-        "bank_summary": bank_summary
-    }
-
-
-# =====================================================
-# 7. TEST RUN
-# =====================================================
-if __name__ == "__main__":
-    df = pd.read_csv("sample_cashflow.csv")
-    results = run_behavior_intelligence(df)
-
-    print("\nACCOUNT BEHAVIOR:")
-    print(results["account_metrics"].head())
-
-    print("\nSTRUCTURAL CASH:")
-    print(results["structural_cash"].head())
-
-    print("\nBANK SUMMARY:")
-    print(results["bank_summary"])
+import pandas as pd
+import numpy as np
+
+# =====================================================
+# 1. PREPROCESS
+# =====================================================
+def preprocess(df):
+    # assign/sort_values already return new frames; no upfront deep copy
+    df = df.assign(Date=pd.to_datetime(df["Date"]))
+    if df["Account_ID"].dtype != "category":
+        df["Account_ID"] = df["Account_ID"].astype("category")
+    df = df.sort_values(["Account_ID", "Date"])
+
+    # Net cash movement
+    df["Net_Cash"] = df["Inflow_INR"] - df["Outflow_INR"]
+
+    # Calendar features from a single day-resolution conversion:
+    # weekday and day-of-month follow as integer arithmetic
+    days = df["Date"].to_numpy(dtype="datetime64[D]")
+    day_codes = days.astype(np.int64)
+    df["DayOfWeek"] = (day_codes + 3) % 7  # epoch day 0 was a Thursday
+    df["DayOfMonth"] = (days - days.astype("datetime64[M]")).astype(np.int64) + 1
+    df["Is_Month_End"] = (df["DayOfMonth"] >= 25).astype(int)
+
+    return df
+
+
+# =====================================================
+# 2. ACCOUNT-LEVEL BEHAVIOR METRICS
+# =====================================================
+def account_behavior_metrics(df):
+    # Single groupby pass for all per-account aggregates
+    m = df.groupby("Account_ID", sort=False, observed=True)[["Inflow_INR", "Outflow_INR"]].agg(["mean", "std"])
+
+    avg_in = m[("Inflow_INR", "mean")]
+    avg_out = m[("Outflow_INR", "mean")]
+    std_out = m[("Outflow_INR", "std")]
+
+    # CV undefined for zero mean; stability 0 where CV is undefined
+    cv_out = std_out / avg_out.where(avg_out > 0)
+    stability_score = (1 / (1 + cv_out)).fillna(0)
+
+    return pd.DataFrame({
+        "Account_ID": m.index,
+        "Avg_Inflow": avg_in.to_numpy(),
+        "Avg_Outflow": avg_out.to_numpy(),
+        "Net_Flow": (avg_in - avg_out).to_numpy(),
+        "Outflow_Volatility": std_out.to_numpy(),
+        "Outflow_CV": cv_out.to_numpy(),
+        "Stability_Score": stability_score.to_numpy()
+    })
+
+
+# =====================================================
+# 3. STRUCTURAL vs VOLATILE CASH
+# =====================================================
+def structural_cash_estimation(df, quantile=0.25):
+    # Single groupby pass; derived columns as vector arithmetic
+    g = df.groupby("Account_ID", sort=False, observed=True)["Inflow_INR"].agg(
+        Structural_Inflow=lambda s: s.quantile(quantile),
+        Mean_Inflow="mean"
+    )
+
+    structural = g["Structural_Inflow"]
+    mean_inflow = g["Mean_Inflow"]
+
+    return pd.DataFrame({
+        "Account_ID": g.index,
+        "Structural_Inflow": structural.to_numpy(),
+        "Volatile_Inflow": (mean_inflow - structural).clip(lower=0).to_numpy(),
+        "Structural_Ratio": (structural / mean_inflow.where(mean_inflow > 0))
+        .fillna(0)
+        .to_numpy()
+    })
+
+
+# =====================================================
+# 4. SEASONALITY & DATE EFFECTS
+# =====================================================
+def seasonality_analysis(df):
+    # Single grouped pass over both calendar keys; each marginal mean
+    # table is derived from the shared sums and counts
+    cells = (
+        df.groupby(["DayOfWeek", "Is_Month_End"], sort=False, observed=True)[["Inflow_INR", "Outflow_INR"]]
+        .agg(["sum", "count"])
+    )
+
+    def marginal_mean(level):
+        g = cells.groupby(level=level).sum()
+        means = pd.DataFrame({
+            "Inflow_INR": g[("Inflow_INR", "sum")] / g[("Inflow_INR", "count")],
+            "Outflow_INR": g[("Outflow_INR", "sum")] / g[("Outflow_INR", "count")]
+        })
+        return means.reset_index()
+
+    # Day-of-week pattern
+    dow = marginal_mean("DayOfWeek")
+
+    # Month-end behavior
+    month_end = marginal_mean("Is_Month_End")
+
+    return dow, month_end
+
+
+# =====================================================
+# 5. BANK-LEVEL ROLLUP
+# =====================================================
+def bank_level_summary(df):
+    bank_daily = (
+        df.groupby("Date", observed=True)[["Inflow_INR", "Outflow_INR", "Net_Cash"]]
+        .sum()
+        .reset_index()
+    )
+
+    summary = {
+        "Avg_Daily_Inflow": bank_daily["Inflow_INR"].mean(),
+        "Avg_Daily_Outflow": bank_daily["Outflow_INR"].mean(),
+        "Net_Position": bank_daily["Net_Cash"].mean(),
+        "Outflow_Volatility": bank_daily["Outflow_INR"].std()
+    }
+
+    return bank_daily, summary
+
+
+# =====================================================
+# 6. MASTER PIPELINE
+# =====================================================
+def run_behavior_intelligence(df):
+    df = preprocess(df)
+
+    account_metrics = account_behavior_metrics(df)
+    structural_cash = structural_cash_estimation(df)
+    dow_pattern, month_end_pattern = seasonality_analysis(df)
+    bank_daily, bank_summary = bank_level_summary(df)
+
+    return {
+        "account_metrics": account_metrics,
+        "structural_cash": structural_cash,
+        "day_of_week_pattern": dow_pattern,
+        "month_end_pattern": month_end_pattern,
+        "bank_daily": bank_daily,
+        "bank_summary": bank_summary
+    }
+
+
+# =====================================================
+# 7. TEST RUN
+# =====================================================
+if __name__ == "__main__":
+    df = pd.read_csv("sample_cashflow.csv")
+    results = run_behavior_intelligence(df)
+
+    print("\nACCOUNT BEHAVIOR:")
+    print(results["account_metrics"].head())
+
+    print("\nSTRUCTURAL CASH:")
+    print(results["structural_cash"].head())
+
+    print("\nBANK SUMMARY:")
+    print(results["bank_summary"])